@@ -0,0 +1,165 @@
+import json
+import math
+import sys
+from datetime import datetime, timezone
+
+from config import load_config
+from state import save_state
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+REVIEW_RESULTS = ('approved', 'rejected')
+
+
+class QuantileSketch:
+    """Квантили по логарифмическим корзинам с относительной ошибкой alpha."""
+
+    def __init__(self, alpha=0.02, buckets=None):
+        """Относительная ошибка alpha, buckets — сохранённые корзины."""
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = buckets or {}
+        self.count = sum(self.buckets.values())
+
+    def add(self, value):
+        """Добавляем значение за O(1)."""
+        index = math.ceil(math.log(max(value, 1)) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+
+    def quantile(self, q):
+        """Оценка квантиля q; число корзин ограничено, а не историей."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                break
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+
+class Aggregate:
+    """Потоковая статистика: количество, среднее, минимум, максимум."""
+
+    def __init__(self, count=0, mean=0.0, minimum=None, maximum=None,
+                 buckets=None):
+        """Восстанавливаем статистику из сохранённых значений."""
+        self.count = count
+        self.mean = mean
+        self.minimum = minimum
+        self.maximum = maximum
+        self.sketch = QuantileSketch(
+            buckets={int(key): value for key, value in (buckets or {}).items()}
+        )
+
+    def add(self, value):
+        """Учитываем новое значение без пересчёта истории."""
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.minimum = value if self.minimum is None else min(
+            self.minimum, value
+        )
+        self.maximum = value if self.maximum is None else max(
+            self.maximum, value
+        )
+        self.sketch.add(value)
+
+    def to_dict(self):
+        """Представление для сохранения в JSON."""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'minimum': self.minimum,
+            'maximum': self.maximum,
+            'buckets': self.sketch.buckets,
+        }
+
+    def describe(self):
+        """Строка отчёта: время проверки в часах."""
+        percentiles = ', '.join(
+            f'p{int(q * 100)} {self.sketch.quantile(q) / 3600:.1f}'
+            for q in (0.5, 0.9, 0.99)
+        )
+        return (f'проверок {self.count}, среднее {self.mean / 3600:.1f}, '
+                f'мин {self.minimum / 3600:.1f}, '
+                f'макс {self.maximum / 3600:.1f}, {percentiles} (ч)')
+
+
+def parse_date(value):
+    """Время date_updated из API в секундах; None, если формат неизвестен."""
+    try:
+        return datetime.strptime(value, DATE_FORMAT).replace(
+            tzinfo=timezone.utc
+        ).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class ReviewAnalytics:
+    """Статистика времени проверки: общая и по каждой работе."""
+
+    def __init__(self, total=None, homeworks=None):
+        """Восстанавливаем общую статистику и статистику по работам."""
+        self.total = Aggregate(**(total or {}))
+        self.homeworks = {
+            name: Aggregate(**values)
+            for name, values in (homeworks or {}).items()
+        }
+
+    def observe(self, homework, previous):
+        """Учитываем переход статуса; True, если это завершённая проверка."""
+        if previous is None or previous[0] != 'reviewing':
+            return False
+        if homework.get('status') not in REVIEW_RESULTS:
+            return False
+        started = parse_date(previous[1])
+        finished = parse_date(homework.get('date_updated'))
+        if started is None or finished is None or finished < started:
+            return False
+        duration = finished - started
+        self.total.add(duration)
+        name = str(homework.get('homework_name'))
+        self.homeworks.setdefault(name, Aggregate()).add(duration)
+        return True
+
+    def to_dict(self):
+        """Представление для сохранения в JSON."""
+        return {
+            'total': self.total.to_dict(),
+            'homeworks': {
+                name: aggregate.to_dict()
+                for name, aggregate in self.homeworks.items()
+            },
+        }
+
+    def report(self):
+        """Текстовый отчёт по времени проверки."""
+        if not self.total.count:
+            return 'Завершённых проверок пока не было'
+        lines = [f'Все работы: {self.total.describe()}']
+        lines.extend(
+            f'{name}: {aggregate.describe()}'
+            for name, aggregate in sorted(self.homeworks.items())
+        )
+        return '\n'.join(lines)
+
+
+def load_analytics(path):
+    """Читаем сохранённую статистику; без файла — пустая статистика."""
+    try:
+        with open(path, encoding='utf-8') as analytics_file:
+            return ReviewAnalytics(**json.load(analytics_file))
+    except (OSError, ValueError, TypeError):
+        return ReviewAnalytics()
+
+
+def save_analytics(path, analytics):
+    """Атомарно сохраняем статистику."""
+    save_state(path, analytics.to_dict())
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else load_config().analytics_path
+    print(load_analytics(path).report())
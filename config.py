@@ -0,0 +1,175 @@
+import json
+import os
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, List, Optional
+
+from exceptions import ConfigError
+
+DEFAULT_CONFIG_PATH = 'config.json'
+
+ENV_OVERRIDES = {
+    'practicum_token': 'PRACTICUM_TOKEN',
+    'telegram_token': 'TELEGRAM_TOKEN',
+    'telegram_chat_id': 'TELEGRAM_CHAT_ID',
+}
+
+
+def default_statuses():
+    """Стандартные вердикты для статусов домашней работы."""
+    return {
+        'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
+        'reviewing': 'Работа взята на проверку ревьюером.',
+        'rejected': 'Работа проверена: у ревьюера есть замечания.'
+    }
+
+
+@dataclass(frozen=True)
+class Config:
+    """Настройки бота: значения из файла конфигурации и окружения."""
+
+    practicum_token: Optional[str] = None
+    telegram_token: Optional[str] = None
+    telegram_chat_id: Optional[str] = None
+    retry_time: int = 600
+    urgent_retry_time: int = 0
+    idle_retry_time: int = 0
+    endpoint: str = (
+        'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+    )
+    homework_statuses: Dict[str, str] = field(
+        default_factory=default_statuses
+    )
+    request_timeout: int = 10
+    state_path: str = 'state.json'
+    digest_window: int = 0
+    digest_max_events: int = 0
+    profile: bool = False
+    profile_report_every: int = 10
+    profile_capture_cycles: int = 1
+    profile_dir: str = '.'
+    shutdown_timeout: int = 20
+    cache_path: str = 'homeworks.db'
+    cache_size: int = 1000
+    cache_ttl: int = 0
+    analytics_path: str = 'analytics.json'
+    rate_limit_path: str = ''
+    rate_limit_per_minute: int = 60
+    rate_limit_burst: int = 10
+    spread_polls: bool = False
+    sinks: List[Dict] = field(
+        default_factory=lambda: [{'type': 'telegram'}]
+    )
+
+
+POSITIVE_FIELDS = (
+    'retry_time', 'cache_size', 'rate_limit_per_minute', 'rate_limit_burst'
+)
+NON_NEGATIVE_FIELDS = ('urgent_retry_time', 'idle_retry_time', 'cache_ttl')
+STARTUP_ONLY_FIELDS = ('state_path', 'cache_path', 'analytics_path')
+
+TYPE_NAMES = {
+    int: 'целым числом',
+    bool: 'true или false',
+    str: 'строкой',
+}
+
+
+def _check_types(values):
+    """Проверяем типы значений из файла конфигурации."""
+    for config_field in fields(Config):
+        expected = config_field.type
+        if config_field.name not in values or expected not in TYPE_NAMES:
+            continue
+        value = values[config_field.name]
+        if type(value) is not expected:
+            raise ConfigError(
+                f'{config_field.name} должен быть {TYPE_NAMES[expected]}'
+            )
+    for name in POSITIVE_FIELDS:
+        if values.get(name, 1) <= 0:
+            raise ConfigError(f'{name} должен быть больше нуля')
+    for name in NON_NEGATIVE_FIELDS:
+        if values.get(name, 0) < 0:
+            raise ConfigError(f'{name} не может быть отрицательным')
+    statuses = values.get('homework_statuses', {})
+    if not isinstance(statuses, dict) or not all(
+        isinstance(key, str) and isinstance(value, str)
+        for key, value in statuses.items()
+    ):
+        raise ConfigError('homework_statuses должен быть словарём строк')
+    sinks = values.get('sinks', [])
+    if not isinstance(sinks, list) or not all(
+        isinstance(sink, dict) and 'type' in sink for sink in sinks
+    ):
+        raise ConfigError('sinks должен быть списком объектов с ключом type')
+
+
+def read_config_file(path):
+    """Читаем JSON-файл конфигурации; отсутствующий файл — пустой конфиг."""
+    try:
+        with open(path, encoding='utf-8') as config_file:
+            values = json.load(config_file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as error:
+        raise ConfigError(f'Не удалось прочитать {path}: {error}')
+    if not isinstance(values, dict):
+        raise ConfigError(f'Конфигурация в {path} должна быть объектом')
+    known = {config_field.name for config_field in fields(Config)}
+    unknown = set(values) - known
+    if unknown:
+        raise ConfigError(f'Неизвестные параметры в {path}: {unknown}')
+    _check_types(values)
+    return values
+
+
+def config_path():
+    """Путь к файлу конфигурации: переменная BOT_CONFIG или config.json."""
+    return os.getenv('BOT_CONFIG', DEFAULT_CONFIG_PATH)
+
+
+def load_config(path=None):
+    """Собираем настройки: файл конфигурации, поверх него окружение."""
+    path = path or config_path()
+    config = replace(Config(), **read_config_file(path))
+    overrides = {
+        name: os.getenv(variable)
+        for name, variable in ENV_OVERRIDES.items()
+        if os.getenv(variable)
+    }
+    return replace(config, **overrides)
+
+
+class ConfigWatcher:
+    """Следим за файлом конфигурации по mtime и по сигналу SIGHUP."""
+
+    def __init__(self, path=None):
+        """Файл конфигурации path, по умолчанию из config_path()."""
+        self.path = path or config_path()
+        self.mtime = self._current_mtime()
+        self.reload_requested = False
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def request_reload(self, *args):
+        """Обработчик SIGHUP: перечитать конфигурацию на следующем цикле."""
+        self.reload_requested = True
+
+    def poll(self):
+        """Возвращаем новые настройки, если файл изменился, иначе None.
+
+        Пропавший файл — ошибка, а не пустая конфигурация: иначе бот
+        откатил бы все настройки к значениям по умолчанию.
+        """
+        mtime = self._current_mtime()
+        if mtime == self.mtime and not self.reload_requested:
+            return None
+        self.mtime = mtime
+        self.reload_requested = False
+        if mtime is None:
+            raise ConfigError(f'Файл {self.path} не найден')
+        return load_config(self.path)
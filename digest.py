@@ -0,0 +1,52 @@
+import time
+
+
+class Digest:
+    """Копим изменения статусов и отправляем их одной сводкой."""
+
+    def __init__(self, window=0, max_events=0, events=None,
+                 clock=time.monotonic):
+        """Изменения events сохранены с прошлого запуска."""
+        self.window = window
+        self.max_events = max_events
+        self.clock = clock
+        self.events = [list(event) for event in events or []]
+        self.started = self.clock() if self.events else None
+
+    @property
+    def enabled(self):
+        """Режим сводки включён, если задано окно или число событий."""
+        return self.window > 0 or self.max_events > 0
+
+    def add(self, homework_name, status):
+        """Добавляем изменение статуса работы в сводку."""
+        if not self.events:
+            self.started = self.clock()
+        self.events.append([homework_name, status])
+
+    def is_due(self):
+        """Пора ли отправлять сводку: истекло окно или набралось событий."""
+        if not self.events:
+            return False
+        if self.max_events and len(self.events) >= self.max_events:
+            return True
+        return bool(self.window) and (
+            self.clock() - self.started >= self.window
+        )
+
+    def render(self, statuses):
+        """Готовим одно сообщение, сгруппированное по статусам."""
+        groups = {}
+        for homework_name, status in self.events:
+            groups.setdefault(status, []).append(homework_name)
+        lines = [f'Изменились статусы проверки работ: {len(self.events)}']
+        for status, names in groups.items():
+            lines.append('')
+            lines.append(statuses.get(status, status))
+            lines.extend(f'— {name}' for name in names)
+        return '\n'.join(lines)
+
+    def clear(self):
+        """Очищаем сводку после успешной отправки."""
+        self.events.clear()
+        self.started = None
@@ -24,3 +24,15 @@ class MainError(Exception):
 
 class ApiKeyError(KeyError):
     """Отсутствует ключ в ответе от API."""
+
+
+class ConfigError(Exception):
+    """Некорректный файл конфигурации."""
+
+
+class SinkError(Exception):
+    """Сообщение не доставлено в канал уведомлений."""
+
+
+class SnapshotError(Exception):
+    """Файл снимка состояния повреждён или имеет неизвестный формат."""
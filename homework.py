@@ -1,45 +1,111 @@
 import json
 import logging
-import os
+import signal
+import sqlite3
 import sys
+import threading
 import time
+from dataclasses import replace
+from functools import partial
 from http import HTTPStatus
-from logging import Formatter, StreamHandler
+from logging import Formatter
 
 import requests
 import telegram
 from dotenv import load_dotenv
 
-from exceptions import (DictEmpty, MainError, Not200Error, NotList,
-                        RequestExceptionError, TelegramError, ApiKeyError)
+from analytics import load_analytics, save_analytics
+from config import STARTUP_ONLY_FIELDS, ConfigWatcher, load_config
+from digest import Digest
+from exceptions import (ApiKeyError, ConfigError, DictEmpty, MainError,
+                        Not200Error, NotList, RequestExceptionError,
+                        TelegramError)
+from profiling import Profiler, TimedStreamHandler
+from ratelimit import build_rate_limiter, phase_offset
+from sinks import Dispatcher, Outbox, build_sinks
+from state import HomeworkCache, load_state, save_state
 
 load_dotenv()
+profiler = Profiler()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
-handler = StreamHandler(stream=sys.stdout)
+handler = TimedStreamHandler(profiler, stream=sys.stdout)
 handler.setFormatter(Formatter(fmt='%(asctime)s, %(levelname)s, %(message)s, '
                                    '%(name)s'))
 logger.addHandler(handler)
 
-PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
-TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
-TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+settings = load_config()
 
-RETRY_TIME = 600
-ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+PRACTICUM_TOKEN = settings.practicum_token
+TELEGRAM_TOKEN = settings.telegram_token
+TELEGRAM_CHAT_ID = settings.telegram_chat_id
+
+RETRY_TIME = settings.retry_time
+URGENT_RETRY_TIME = settings.urgent_retry_time
+IDLE_RETRY_TIME = settings.idle_retry_time
+ENDPOINT = settings.endpoint
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
-HOMEWORK_STATUSES = {
-    'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
-    'reviewing': 'Работа взята на проверку ревьюером.',
-    'rejected': 'Работа проверена: у ревьюера есть замечания.'
-}
+HOMEWORK_STATUSES = settings.homework_statuses
+REQUEST_TIMEOUT = settings.request_timeout
+STATE_PATH = settings.state_path
+DIGEST_WINDOW = settings.digest_window
+DIGEST_MAX_EVENTS = settings.digest_max_events
+SHUTDOWN_TIMEOUT = settings.shutdown_timeout
+CACHE_PATH = settings.cache_path
+CACHE_SIZE = settings.cache_size
+CACHE_TTL = settings.cache_ttl
+ANALYTICS_PATH = settings.analytics_path
+SPREAD_POLLS = settings.spread_polls
+rate_limiter = build_rate_limiter(settings)
+profiler.configure(settings.profile, settings.profile_report_every,
+                   settings.profile_capture_cycles, settings.profile_dir)
+
+WATCH_INTERVAL = 5
+
+shutdown = threading.Event()
+wakeup = threading.Event()
+stop_signals = []
+
+
+def apply_config(config):
+    """Применяем настройки к модулю без перезапуска бота.
+
+    Пути к файлам состояния, кэша и статистики задаются только при запуске.
+    """
+    global settings, PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
+    global RETRY_TIME, URGENT_RETRY_TIME, IDLE_RETRY_TIME
+    global ENDPOINT, HEADERS, HOMEWORK_STATUSES
+    global REQUEST_TIMEOUT, DIGEST_WINDOW, DIGEST_MAX_EVENTS
+    global SHUTDOWN_TIMEOUT, CACHE_SIZE, CACHE_TTL
+    global SPREAD_POLLS, rate_limiter
+    settings = config
+    PRACTICUM_TOKEN = config.practicum_token
+    TELEGRAM_TOKEN = config.telegram_token
+    TELEGRAM_CHAT_ID = config.telegram_chat_id
+    RETRY_TIME = config.retry_time
+    URGENT_RETRY_TIME = config.urgent_retry_time
+    IDLE_RETRY_TIME = config.idle_retry_time
+    ENDPOINT = config.endpoint
+    HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+    HOMEWORK_STATUSES = config.homework_statuses
+    REQUEST_TIMEOUT = config.request_timeout
+    DIGEST_WINDOW = config.digest_window
+    DIGEST_MAX_EVENTS = config.digest_max_events
+    SHUTDOWN_TIMEOUT = config.shutdown_timeout
+    CACHE_SIZE = config.cache_size
+    CACHE_TTL = config.cache_ttl
+    SPREAD_POLLS = config.spread_polls
+    rate_limiter = build_rate_limiter(config)
+    profiler.configure(config.profile, config.profile_report_every,
+                       config.profile_capture_cycles, config.profile_dir)
 
 
 def send_message(bot, message):
     """Отправляем сообщение в Telegram."""
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
+        with profiler.stage('send_message'):
+            bot.send_message(TELEGRAM_CHAT_ID, message)
     except telegram.TelegramError as error:
         logger.critical(error)
         raise TelegramError(error)
@@ -47,17 +113,37 @@ def send_message(bot, message):
     logger.info(info_message)
 
 
+def acquire_request():
+    """Берём токен общего лимита запросов; False, если бот завершается.
+
+    Если база ограничителя недоступна, опрашиваем API без лимита.
+    """
+    if rate_limiter is None:
+        return True
+    try:
+        return rate_limiter.acquire(shutdown.wait)
+    except sqlite3.Error as error:
+        logger.error(f'Ограничитель запросов недоступен, '
+                     f'запрос без лимита: {error}')
+        return True
+
+
 def get_api_answer(current_timestamp):
     """Получаем ответ от API Practicum и проверяем, что API доступно."""
     timestamp = current_timestamp or int(time.time())
     params = {'from_date': timestamp}
+    if not acquire_request():
+        raise RequestExceptionError('Запрос отменён: бот завершает работу')
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
+        with profiler.stage('http'):
+            response = requests.get(ENDPOINT, headers=HEADERS, params=params,
+                                    timeout=REQUEST_TIMEOUT)
         if response.status_code != HTTPStatus.OK:
             message = 'Что-то не так с API Practicum (ответ сервера не 200)'
             logger.error(message)
             raise Not200Error(message)
-        return response.json()
+        with profiler.stage('json'):
+            return response.json()
     except requests.exceptions.RequestException as error:
         logger.critical(error)
         raise RequestExceptionError(error)
@@ -68,6 +154,10 @@ def get_api_answer(current_timestamp):
 
 def check_response(response):
     """Проверяем ответ от API: все ключи приходят, известен ли нам статус."""
+    if not isinstance(response, dict):
+        message = 'Ответ API представлен не словарём'
+        logger.error(message)
+        raise TypeError(message)
     try:
         homeworks_list = response['homeworks']
     except KeyError as error:
@@ -83,8 +173,13 @@ def check_response(response):
         logger.error(message)
         raise NotList(message)
     if homeworks_list:
+        if not isinstance(homeworks_list[0], dict):
+            message = 'Домашняя работа в ответе API представлена не словарём'
+            logger.error(message)
+            raise TypeError(message)
         homeworks_status = homeworks_list[0].get('status')
-        if homeworks_status not in HOMEWORK_STATUSES:
+        if not isinstance(homeworks_status, str) or (
+                homeworks_status not in HOMEWORK_STATUSES):
             message = 'Неизвестный статус домашней работы'
             logger.error(message)
     return homeworks_list
@@ -92,6 +187,10 @@ def check_response(response):
 
 def parse_status(homework):
     """Проверяем статус работы и готовим сообщение об изменении статуса."""
+    if not isinstance(homework, dict):
+        message = 'Домашняя работа в ответе API представлена не словарём'
+        logger.error(message)
+        raise TypeError(message)
     if 'homework_name' not in homework:
         message = 'В ответе API отсутствует ключ homework_name'
         logger.error(message)
@@ -102,7 +201,8 @@ def parse_status(homework):
         raise ApiKeyError(message)
     homework_name = homework['homework_name']
     homework_status = homework['status']
-    if homework_status not in HOMEWORK_STATUSES:
+    if not isinstance(homework_status, str) or (
+            homework_status not in HOMEWORK_STATUSES):
         message = f'Статус работы отсутствует в списке: {homework_status} '
         logger.error(message)
         raise ApiKeyError(message)
@@ -134,33 +234,260 @@ def check_tokens():
         return False
 
 
+def build_dispatcher(bot, config, outbox):
+    """Создаём рассылку по каналам уведомлений из конфигурации."""
+    sinks = build_sinks(config.sinks, partial(send_message, bot))
+    return Dispatcher(sinks, logger, outbox)
+
+
+def keep_startup_paths(config):
+    """Оставляем пути к файлам, с которыми бот запущен."""
+    changed = [
+        name for name in STARTUP_ONLY_FIELDS
+        if getattr(config, name) != getattr(settings, name)
+    ]
+    if changed:
+        logger.warning(
+            f'Параметры {", ".join(changed)} применяются только при запуске'
+        )
+    return replace(config, **{
+        name: getattr(settings, name) for name in STARTUP_ONLY_FIELDS
+    })
+
+
+def reload_config(watcher, bot, dispatcher):
+    """Перечитываем конфигурацию; при ошибке продолжаем работать со старой."""
+    try:
+        config = watcher.poll()
+        if config is None:
+            return bot, dispatcher
+        if not (config.practicum_token and config.telegram_token
+                and config.telegram_chat_id):
+            raise ConfigError('не хватает токенов')
+        new_bot = bot
+        if config.telegram_token != settings.telegram_token:
+            new_bot = telegram.Bot(token=config.telegram_token)
+        new_dispatcher = build_dispatcher(new_bot, config, dispatcher.outbox)
+    except ConfigError as error:
+        logger.error(f'Конфигурация не перезагружена: {error}')
+        return bot, dispatcher
+    apply_config(keep_startup_paths(config))
+    dispatcher.close(timeout=0)
+    new_dispatcher.resend()
+    logger.info('Конфигурация перезагружена')
+    return new_bot, new_dispatcher
+
+
+def notify(dispatcher, digest, homework):
+    """Рассылаем сообщение сразу или копим его в сводке."""
+    with profiler.stage('parse_status'):
+        message = parse_status(homework)
+    if digest.enabled:
+        digest.add(homework['homework_name'], homework['status'])
+        logger.debug(f'Изменение статуса добавлено в сводку: {message}')
+    else:
+        dispatcher.dispatch(message)
+
+
+def flush_digest(dispatcher, digest, force=False):
+    """Рассылаем сводку, если пришло её время или бот завершает работу.
+
+    Накопленную сводку отправляем и тогда, когда режим сводки отключили
+    в конфигурации. Сводка переходит в outbox рассылки и сохраняется
+    вместе с ним.
+    """
+    if digest.events and (force or not digest.enabled or digest.is_due()):
+        dispatcher.dispatch(digest.render(HOMEWORK_STATUSES))
+        digest.clear()
+
+
+def save_progress(state, outbox):
+    """Сохраняем состояние вместе с недоставленными сообщениями."""
+    state['outbox'] = outbox.snapshot()
+    save_state(STATE_PATH, state)
+
+
+def log_profile():
+    """Записываем в лог отчёты профилировщика за завершённый цикл."""
+    for report in profiler.end_cycle():
+        logger.info(report)
+
+
+def request_shutdown(signum, frame):
+    """Обработчик SIGTERM/SIGINT: завершаем текущий цикл и выходим.
+
+    Из обработчика не пишем в лог: сигнал может прийти, пока основной
+    поток держит блокировку профилировщика или обработчика логов.
+    Полученный сигнал записываем в лог после выхода из цикла.
+    """
+    stop_signals.append(signum)
+    shutdown.set()
+    wakeup.set()
+
+
+def request_reload(watcher, signum, frame):
+    """Обработчик SIGHUP: будим бота, чтобы перечитать конфигурацию."""
+    watcher.request_reload()
+    wakeup.set()
+
+
+def homework_key(homework):
+    """Ключ работы в кэше: id, а без него — название работы."""
+    return str(homework.get('id', homework.get('homework_name')))
+
+
+def track_open(state, key, status):
+    """Запоминаем работы, которые ещё не приняты: от них ждём изменений.
+
+    Храним не больше CACHE_SIZE последних изменившихся работ, чтобы
+    брошенные работы не копились в состоянии бесконечно.
+    """
+    open_homeworks = state['open']
+    open_homeworks.pop(key, None)
+    if status != 'approved':
+        open_homeworks[key] = status
+    while len(open_homeworks) > CACHE_SIZE:
+        del open_homeworks[next(iter(open_homeworks))]
+
+
+def poll_due(last_poll, state):
+    """Пора ли опрашивать API; иначе ждём, но не дольше WATCH_INTERVAL.
+
+    Ожидание прерывают SIGHUP и SIGTERM, а короткие отрезки позволяют
+    заметить изменение файла конфигурации, не дожидаясь опроса.
+    """
+    if last_poll is None:
+        return True
+    left = last_poll + poll_interval(state) - time.monotonic()
+    if left <= 0:
+        return True
+    wakeup.wait(min(left, WATCH_INTERVAL))
+    wakeup.clear()
+    return False
+
+
+def poll_interval(state):
+    """Пауза до следующего опроса: на проверке — чаще, всё принято — реже."""
+    open_statuses = state['open'].values()
+    if 'reviewing' in open_statuses:
+        return URGENT_RETRY_TIME or RETRY_TIME
+    if not open_statuses:
+        return IDLE_RETRY_TIME or RETRY_TIME
+    return RETRY_TIME
+
+
+def update_homework(dispatcher, digest, cache, analytics, state, homework):
+    """Обрабатываем одну работу; True, если её статус изменился."""
+    if not isinstance(homework, dict):
+        raise TypeError(
+            'Домашняя работа в ответе API представлена не словарём'
+        )
+    key = homework_key(homework)
+    previous = cache.get(key)
+    if previous and previous[0] == homework.get('status'):
+        return False
+    notify(dispatcher, digest, homework)
+    if analytics.observe(homework, previous):
+        logger.info(f'Время проверки: {analytics.total.describe()}')
+    cache.set(key, homework['status'], homework.get('date_updated'))
+    track_open(state, key, homework['status'])
+    return True
+
+
+def check_updates(dispatcher, digest, cache, analytics, state):
+    """Один цикл опроса: запрос к API, уведомление, сохранение состояния."""
+    response = get_api_answer(state['current_timestamp'])
+    with profiler.stage('check_response'):
+        homework_list = check_response(response)
+    changed = 0
+    for homework in reversed(homework_list):
+        try:
+            changed += update_homework(
+                dispatcher, digest, cache, analytics, state, homework
+            )
+        except (TypeError, ApiKeyError) as error:
+            logger.error(f'Работа пропущена: {error}')
+    if changed:
+        cache.flush()
+        save_analytics(ANALYTICS_PATH, analytics)
+        save_progress(state, dispatcher.outbox)
+        message = 'Проверка обновлений успешно завершена'
+        logger.info(message)
+    else:
+        message = 'Обновлений не было'
+        logger.info(message)
+    flush_digest(dispatcher, digest)
+    dispatcher.resend()
+    state['current_timestamp'] = int(time.time())
+    save_progress(state, dispatcher.outbox)
+
+
+def set_signal_handlers(watcher):
+    """Подключаем обработчики сигналов перезагрузки, профиля и остановки."""
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, partial(request_reload, watcher))
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, profiler.request_capture)
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+
+
 def main():
     """Основная логика работы бота."""
     if not check_tokens():
         exit()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = int(time.time())
-    check_status = ''
-    while True:
+    state = load_state(STATE_PATH)
+    dispatcher = build_dispatcher(bot, settings, Outbox(state['outbox']))
+    dispatcher.resend()
+    watcher = ConfigWatcher()
+    set_signal_handlers(watcher)
+    state['current_timestamp'] = (state['current_timestamp']
+                                  or int(time.time()))
+    digest = Digest(events=state['digest'])
+    state['digest'] = digest.events
+    cache = HomeworkCache(CACHE_PATH, CACHE_SIZE, CACHE_TTL)
+    analytics = load_analytics(ANALYTICS_PATH)
+    if SPREAD_POLLS:
+        offset = phase_offset(PRACTICUM_TOKEN, RETRY_TIME)
+        logger.info(f'Первый опрос API через {offset} с')
+        shutdown.wait(offset)
+    last_poll = None
+    while not shutdown.is_set():
+        bot, dispatcher = reload_config(watcher, bot, dispatcher)
+        digest.window = DIGEST_WINDOW
+        digest.max_events = DIGEST_MAX_EVENTS
+        cache.max_size = CACHE_SIZE
+        cache.ttl = CACHE_TTL
+        if not poll_due(last_poll, state):
+            continue
+        last_poll = time.monotonic()
+        profiler.start_cycle()
         try:
-            response = get_api_answer(current_timestamp)
-            homework_list = check_response(response)
-            if homework_list and check_status != homework_list[0]['status']:
-                message = parse_status(homework_list[0])
-                send_message(bot, message)
-                check_status = homework_list[0]['status']
-                message = 'Проверка обновлений успешно завершена'
-                logger.info(message)
-            else:
-                message = 'Обновлений не было'
-                logger.info(message)
-            current_timestamp = int(time.time())
-            time.sleep(RETRY_TIME)
+            check_updates(dispatcher, digest, cache, analytics, state)
+            log_profile()
         except Exception as error:
             message = f'Сбой в работе программы: {error}'
             logger.error(message)
-            time.sleep(RETRY_TIME)
+            cache.flush()
+            save_analytics(ANALYTICS_PATH, analytics)
+            save_progress(state, dispatcher.outbox)
+            if shutdown.wait(RETRY_TIME):
+                break
             raise MainError(message)
+    if stop_signals:
+        logger.info(f'Получен сигнал {stop_signals[0]}, завершаем работу')
+    flush_digest(dispatcher, digest, force=True)
+    undelivered = dispatcher.close(timeout=SHUTDOWN_TIMEOUT)
+    if undelivered:
+        logger.error(
+            f'Не доставлено сообщений до остановки: {undelivered}, '
+            f'они сохранены и будут отправлены после перезапуска'
+        )
+    cache.close()
+    save_analytics(ANALYTICS_PATH, analytics)
+    save_progress(state, dispatcher.outbox)
+    logger.info('Бот остановлен, состояние сохранено')
 
 
 if __name__ == '__main__':
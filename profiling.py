@@ -0,0 +1,143 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import nullcontext
+from logging import StreamHandler
+
+NO_STAGE = nullcontext()
+
+
+class Stage:
+    """Замер одного этапа цикла монотонными часами."""
+
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        """Этап name, замеры которого получает profiler."""
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        """Запоминаем время начала этапа."""
+        self.started = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Передаём длительность этапа профилировщику."""
+        self.profiler.record(self.name, self.profiler.clock() - self.started)
+        return False
+
+
+class Profiler:
+    """Считаем время этапов цикла и по сигналу снимаем профиль cProfile."""
+
+    def __init__(self, clock=time.perf_counter):
+        """Замеры ведём часами clock."""
+        self.clock = clock
+        self.enabled = False
+        self.report_every = 10
+        self.capture_cycles = 1
+        self.capture_dir = '.'
+        self.stages = {}
+        self.cycles = 0
+        self.capture = None
+        self.capture_left = 0
+        self.capture_requested = False
+        self.lock = threading.Lock()
+
+    def configure(self, enabled, report_every, capture_cycles, capture_dir):
+        """Применяем настройки профилирования из конфигурации."""
+        self.enabled = enabled
+        self.report_every = report_every
+        self.capture_cycles = capture_cycles
+        self.capture_dir = capture_dir
+
+    def stage(self, name):
+        """Контекст для замера этапа; без профилирования ничего не делает."""
+        if not self.enabled:
+            return NO_STAGE
+        return Stage(self, name)
+
+    def record(self, name, elapsed):
+        """Добавляем замер: число вызовов, суммарное и максимальное время.
+
+        Замеры приходят и из потоков каналов доставки, поэтому под lock.
+        """
+        with self.lock:
+            totals = self.stages.get(name)
+            if totals is None:
+                self.stages[name] = [1, elapsed, elapsed]
+                return
+            totals[0] += 1
+            totals[1] += elapsed
+            if elapsed > totals[2]:
+                totals[2] = elapsed
+
+    def request_capture(self, *args):
+        """Обработчик SIGUSR1: снять профиль cProfile со следующих циклов."""
+        self.capture_requested = True
+
+    def start_cycle(self):
+        """Начало цикла: при запросе включаем cProfile."""
+        if self.capture_requested and self.capture is None:
+            self.capture_requested = False
+            self.capture_left = self.capture_cycles
+            self.capture = cProfile.Profile()
+            self.capture.enable()
+
+    def end_cycle(self):
+        """Конец цикла: возвращаем отчёты, которые пора записать в лог."""
+        reports = []
+        if self.capture is not None:
+            self.capture_left -= 1
+            if self.capture_left <= 0:
+                reports.append(self.dump_capture())
+        if self.enabled:
+            self.cycles += 1
+            if self.cycles >= self.report_every:
+                reports.append(self.summary())
+        return reports
+
+    def dump_capture(self):
+        """Сохраняем профиль в .pstats и возвращаем самые дорогие вызовы."""
+        self.capture.disable()
+        path = os.path.join(
+            self.capture_dir, f'profile-{int(time.time())}.pstats'
+        )
+        self.capture.dump_stats(path)
+        output = io.StringIO()
+        stats = pstats.Stats(self.capture, stream=output)
+        stats.sort_stats('cumulative').print_stats(15)
+        self.capture = None
+        return f'Профиль сохранён в {path}\n{output.getvalue()}'
+
+    def summary(self):
+        """Сводка по этапам за последние циклы; счётчики обнуляются."""
+        lines = [f'Время этапов за {self.cycles} циклов '
+                 '(вызовов, всего мс, среднее мс, максимум мс):']
+        with self.lock:
+            stages, self.stages = self.stages, {}
+        for name, (count, total, longest) in stages.items():
+            lines.append(
+                f'{name}: {count}, {total * 1000:.1f}, '
+                f'{total * 1000 / count:.2f}, {longest * 1000:.2f}'
+            )
+        self.cycles = 0
+        return '\n'.join(lines)
+
+
+class TimedStreamHandler(StreamHandler):
+    """Обработчик логов, время записи которого учитывает профилировщик."""
+
+    def __init__(self, profiler, stream=None):
+        """Пишем в stream, время записи передаём profiler."""
+        super().__init__(stream=stream)
+        self.profiler = profiler
+
+    def emit(self, record):
+        """Записываем сообщение, замеряя время этапа logging."""
+        with self.profiler.stage('logging'):
+            super().emit(record)
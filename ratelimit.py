@@ -0,0 +1,86 @@
+import hashlib
+import sqlite3
+import time
+from contextlib import closing
+
+
+class RateLimiter:
+    """Token bucket в SQLite: общий лимит запросов для всех процессов.
+
+    Состояние корзины хранится в файле базы, а изменения идут в транзакции
+    BEGIN IMMEDIATE, поэтому воркеры на одной машине делят один лимит.
+    """
+
+    def __init__(self, path, per_minute, burst, name='practicum',
+                 clock=time.time):
+        """Корзина name в базе path: per_minute токенов в минуту."""
+        self.path = path
+        self.rate = per_minute / 60
+        self.burst = burst
+        self.name = name
+        self.clock = clock
+
+    def _connect(self):
+        connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None
+        )
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS buckets '
+            '(name TEXT PRIMARY KEY, tokens REAL, updated REAL)'
+        )
+        return connection
+
+    def try_acquire(self):
+        """Берём токен; возвращаем 0 или сколько секунд ждать следующего."""
+        with closing(self._connect()) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                now = self.clock()
+                row = connection.execute(
+                    'SELECT tokens, updated FROM buckets WHERE name = ?',
+                    (self.name,)
+                ).fetchone()
+                tokens = self.burst
+                if row is not None:
+                    tokens = min(
+                        self.burst, row[0] + (now - row[1]) * self.rate
+                    )
+                delay = 0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    delay = (1 - tokens) / self.rate
+                connection.execute(
+                    'INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)',
+                    (self.name, tokens, now)
+                )
+                connection.execute('COMMIT')
+            except sqlite3.Error:
+                connection.execute('ROLLBACK')
+                raise
+        return delay
+
+    def acquire(self, wait=time.sleep):
+        """Ждём токен; False, если ожидание прервано (wait вернул True)."""
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return True
+            if wait(delay):
+                return False
+
+
+def build_rate_limiter(config):
+    """Создаём ограничитель из настроек; без rate_limit_path — без лимита."""
+    if not config.rate_limit_path:
+        return None
+    return RateLimiter(
+        config.rate_limit_path, config.rate_limit_per_minute,
+        config.rate_limit_burst
+    )
+
+
+def phase_offset(key, period):
+    """Стабильный сдвиг первого опроса внутри периода для данного ключа."""
+    digest = hashlib.sha256(str(key).encode()).hexdigest()
+    return int(digest, 16) % max(int(period), 1)
@@ -0,0 +1,281 @@
+import abc
+import smtplib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from email.message import EmailMessage
+from functools import partial
+
+import requests
+
+from exceptions import ConfigError, SinkError
+
+
+class Sink(abc.ABC):
+    """Канал доставки уведомлений со своей политикой повторов и таймаутом."""
+
+    def __init__(self, name, retries=2, retry_delay=1, timeout=10):
+        """Канал name: retries повторов с паузой от retry_delay секунд."""
+        self.name = name
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+
+    @abc.abstractmethod
+    def send(self, message):
+        """Одна попытка доставки; реализуется в наследниках."""
+
+    def deliver(self, message, wait=time.sleep):
+        """Доставляем сообщение, повторяя попытки с растущей паузой.
+
+        Пауза между попытками прерывается, если wait вернул True.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                return self.send(message)
+            except Exception as error:
+                if attempt == self.retries:
+                    raise SinkError(f'Канал {self.name}: {error}') from error
+                if wait(self.retry_delay * 2 ** attempt):
+                    raise SinkError(
+                        f'Канал {self.name}: доставка прервана'
+                    ) from error
+
+
+class FunctionSink(Sink):
+    """Канал, который отправляет сообщение переданной функцией."""
+
+    def __init__(self, name, function, **options):
+        """Сообщение отправляется функцией function."""
+        super().__init__(name, **options)
+        self.function = function
+
+    def send(self, message):
+        """Вызываем функцию отправки."""
+        self.function(message)
+
+
+class WebhookSink(Sink):
+    """Отправляем сообщение POST-запросом с JSON {"text": ...}."""
+
+    def __init__(self, name, url, **options):
+        """Запрос отправляется на адрес url."""
+        super().__init__(name, **options)
+        self.url = url
+
+    def send(self, message):
+        """Отправляем запрос и проверяем код ответа."""
+        response = requests.post(
+            self.url, json={'text': message}, timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class SmtpSink(Sink):
+    """Отправляем сообщение письмом через SMTP-сервер."""
+
+    def __init__(self, name, sender, recipients, host='localhost', port=25,
+                 subject='Статус проверки домашней работы', **options):
+        """Письма от sender для recipients через сервер host:port."""
+        super().__init__(name, **options)
+        self.sender = sender
+        self.recipients = recipients
+        self.host = host
+        self.port = port
+        self.subject = subject
+
+    def send(self, message):
+        """Собираем письмо и отправляем его."""
+        email = EmailMessage()
+        email['From'] = self.sender
+        email['To'] = ', '.join(self.recipients)
+        email['Subject'] = self.subject
+        email.set_content(message)
+        with smtplib.SMTP(self.host, self.port,
+                          timeout=self.timeout) as smtp:
+            smtp.send_message(email)
+
+
+class FileSink(Sink):
+    """Дописываем сообщение в файл; путь "-" означает stdout."""
+
+    def __init__(self, name, path='-', **options):
+        """Сообщения пишутся в файл path или в stdout для "-"."""
+        super().__init__(name, **options)
+        self.path = path
+
+    def send(self, message):
+        """Записываем сообщение отдельной строкой."""
+        if self.path == '-':
+            print(message, file=sys.stdout, flush=True)
+            return
+        with open(self.path, 'a', encoding='utf-8') as sink_file:
+            sink_file.write(f'{message}\n')
+
+
+SINK_TYPES = {
+    'webhook': WebhookSink,
+    'smtp': SmtpSink,
+    'file': FileSink,
+}
+
+
+def build_sinks(specs, telegram_send):
+    """Создаём каналы по описаниям из конфигурации."""
+    sinks = []
+    for spec in specs:
+        options = dict(spec)
+        sink_type = options.pop('type', None)
+        name = options.pop('name', sink_type)
+        if any(sink.name == name for sink in sinks):
+            raise ConfigError(
+                f'Повторяется имя канала {name}: задайте каналам разные name'
+            )
+        try:
+            if sink_type == 'telegram':
+                sinks.append(FunctionSink(name, telegram_send, **options))
+            elif sink_type in SINK_TYPES:
+                sinks.append(SINK_TYPES[sink_type](name, **options))
+            else:
+                raise ConfigError(f'Неизвестный тип канала: {sink_type}')
+        except TypeError as error:
+            raise ConfigError(f'Некорректный канал {name}: {error}')
+    return sinks
+
+
+class Outbox:
+    """Недоставленные сообщения: пары [канал, текст], общие для рассылок.
+
+    Запись удаляется только после успешной доставки, поэтому снимок
+    outbox можно сохранить в state.json и дослать после перезапуска.
+    Записи, которые сейчас доставляются, помечены как занятые: их не
+    отправит повторно ни эта рассылка, ни рассылка после перезагрузки.
+    """
+
+    def __init__(self, entries=None):
+        """Записи entries сохранены с прошлого запуска."""
+        self.entries = [list(entry) for entry in entries or []]
+        self.claimed = set()
+        self.lock = threading.Lock()
+
+    def add(self, sink_name, message):
+        """Добавляем сообщение для канала; запись сразу занята доставкой."""
+        entry = [sink_name, message]
+        with self.lock:
+            self.entries.append(entry)
+            self.claimed.add(id(entry))
+        return entry
+
+    def claim_free(self):
+        """Занимаем и возвращаем записи, которые сейчас не доставляются."""
+        with self.lock:
+            free = [
+                entry for entry in self.entries
+                if id(entry) not in self.claimed
+            ]
+            self.claimed.update(id(entry) for entry in free)
+        return free
+
+    def release(self, entry):
+        """Освобождаем недоставленную запись для повторной отправки."""
+        with self.lock:
+            self.claimed.discard(id(entry))
+
+    def remove(self, entry):
+        """Удаляем доставленную запись."""
+        with self.lock:
+            self.claimed.discard(id(entry))
+            for index, candidate in enumerate(self.entries):
+                if candidate is entry:
+                    del self.entries[index]
+                    return
+
+    def snapshot(self):
+        """Копия записей для сохранения."""
+        with self.lock:
+            return [list(entry) for entry in self.entries]
+
+    def __len__(self):
+        """Число недоставленных сообщений."""
+        with self.lock:
+            return len(self.entries)
+
+
+class Dispatcher:
+    """Рассылаем сообщение во все каналы, у каждого канала свой поток.
+
+    Каждое сообщение сперва попадает в outbox и удаляется из него только
+    после успешной доставки; недоставленное можно отправить повторно через
+    resend() или сохранить и дослать после перезапуска.
+    """
+
+    def __init__(self, sinks, logger, outbox):
+        """Для каждого канала из sinks создаём поток доставки."""
+        self.sinks = {sink.name: sink for sink in sinks}
+        self.logger = logger
+        self.outbox = outbox
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.executors = {
+            sink.name: ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f'sink-{sink.name}'
+            )
+            for sink in sinks
+        }
+        self.pending = set()
+
+    def dispatch(self, message):
+        """Кладём сообщение в outbox каждого канала и не ждём доставки."""
+        for sink in self.sinks.values():
+            self._submit(sink, self.outbox.add(sink.name, message))
+
+    def resend(self):
+        """Повторно отправляем записи outbox, которые сейчас не доставляются.
+
+        Записи для каналов, которых больше нет в конфигурации, удаляем.
+        """
+        for entry in self.outbox.claim_free():
+            sink = self.sinks.get(entry[0])
+            if sink is None:
+                self.logger.error(
+                    f'Канала {entry[0]} нет в конфигурации, '
+                    f'сообщение не доставлено: {entry[1]}'
+                )
+                self.outbox.remove(entry)
+                continue
+            self._submit(sink, entry)
+
+    def _submit(self, sink, entry):
+        with self.lock:
+            future = self.executors[sink.name].submit(
+                sink.deliver, entry[1], self.stopping.wait
+            )
+            self.pending.add(future)
+        future.add_done_callback(partial(self._delivered, entry))
+
+    def _delivered(self, entry, future):
+        with self.lock:
+            self.pending.discard(future)
+        if not future.cancelled() and future.exception() is None:
+            self.outbox.remove(entry)
+            return
+        if not future.cancelled():
+            self.logger.critical(
+                f'Сообщение не доставлено: {future.exception()}'
+            )
+        self.outbox.release(entry)
+
+    def close(self, timeout):
+        """Ждём доставки не дольше timeout, остальное отменяем.
+
+        Отменённые и недоставленные сообщения остаются в outbox; возвращаем
+        их число.
+        """
+        with self.lock:
+            futures = list(self.pending)
+        wait(futures, timeout=timeout)
+        self.stopping.set()
+        for executor in self.executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        return len(self.outbox)
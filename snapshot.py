@@ -0,0 +1,217 @@
+import calendar
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+
+from analytics import DATE_FORMAT
+from config import load_config
+from exceptions import SnapshotError
+from state import HomeworkCache, load_state, save_state
+
+MAGIC = b'HWBS'
+VERSION = 1
+HEADER = struct.Struct('<4sH')
+RECORD = struct.Struct('<BI')
+HOMEWORK = struct.Struct('<qIII')
+
+RECORD_END = 0
+RECORD_STATE = 1
+RECORD_HOMEWORK = 2
+
+NO_DATE = -1
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z')
+DATE_PARTS = re.compile(r'\d+')
+
+
+def encode_date(value):
+    """date_updated из API в секунды UTC; NO_DATE, если формат неизвестен."""
+    if not isinstance(value, str) or not DATE_PATTERN.fullmatch(value):
+        return NO_DATE
+    return calendar.timegm(tuple(map(int, DATE_PARTS.findall(value))))
+
+
+def decode_date(value):
+    """Секунды UTC обратно в формат date_updated."""
+    if value == NO_DATE:
+        return None
+    return time.strftime(DATE_FORMAT, time.gmtime(value))
+
+
+class SnapshotWriter:
+    """Потоковая запись снимка: заголовок, записи, контрольная сумма."""
+
+    def __init__(self, stream):
+        """Сразу пишем заголовок снимка в stream."""
+        self.stream = stream
+        self.crc = 0
+        stream.write(HEADER.pack(MAGIC, VERSION))
+
+    def _record(self, kind, payload):
+        chunk = RECORD.pack(kind, len(payload)) + payload
+        self.crc = zlib.crc32(chunk, self.crc)
+        self.stream.write(chunk)
+
+    def write_state(self, state):
+        """Записываем курсор, незакрытые работы, сводку и outbox."""
+        self._record(RECORD_STATE, json.dumps(state).encode())
+
+    def write_homework(self, key, status, date_updated):
+        """Записываем последний статус одной работы.
+
+        Дату, которая не восстанавливается из секунд без потерь, храним
+        ещё и как есть, в JSON.
+        """
+        key = key.encode()
+        status = status.encode()
+        date = encode_date(date_updated)
+        raw_date = b''
+        if decode_date(date) != date_updated:
+            raw_date = json.dumps(date_updated).encode()
+        self._record(
+            RECORD_HOMEWORK,
+            HOMEWORK.pack(date, len(key), len(status), len(raw_date))
+            + key + status + raw_date
+        )
+
+    def close(self):
+        """Завершаем снимок записью с контрольной суммой."""
+        self.stream.write(
+            RECORD.pack(RECORD_END, 4) + struct.pack('<I', self.crc)
+        )
+
+
+def read_snapshot(path):
+    """Читаем снимок через mmap и по очереди отдаём (тип, значение)."""
+    with open(path, 'rb') as snapshot_file:
+        try:
+            data = mmap.mmap(
+                snapshot_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except ValueError:
+            raise SnapshotError('Файл снимка пустой')
+        with data:
+            yield from _records(data)
+
+
+def _check_header(data):
+    if len(data) < HEADER.size:
+        raise SnapshotError('Файл снимка слишком короткий')
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError('Файл не является снимком состояния бота')
+    if version != VERSION:
+        raise SnapshotError(f'Неизвестная версия снимка: {version}')
+
+
+def _records(data):
+    _check_header(data)
+    offset = HEADER.size
+    crc = 0
+    while True:
+        if offset + RECORD.size > len(data):
+            raise SnapshotError('Снимок оборван')
+        kind, length = RECORD.unpack_from(data, offset)
+        start = offset + RECORD.size
+        end = start + length
+        if end > len(data):
+            raise SnapshotError('Снимок оборван')
+        if kind == RECORD_END:
+            if struct.unpack_from('<I', data, start)[0] != crc:
+                raise SnapshotError('Контрольная сумма снимка не совпадает')
+            return
+        crc = zlib.crc32(data[offset:end], crc)
+        try:
+            value = _decode(kind, data, start, end)
+        except (ValueError, struct.error) as error:
+            raise SnapshotError(f'Запись снимка повреждена: {error}')
+        yield kind, value
+        offset = end
+
+
+def _decode(kind, data, start, end):
+    if kind == RECORD_STATE:
+        return json.loads(data[start:end])
+    if kind == RECORD_HOMEWORK:
+        return _decode_homework(data, start)
+    raise SnapshotError(f'Неизвестный тип записи: {kind}')
+
+
+def _decode_homework(data, start):
+    date, key_length, status_length, raw_length = HOMEWORK.unpack_from(
+        data, start
+    )
+    key_start = start + HOMEWORK.size
+    status_start = key_start + key_length
+    raw_start = status_start + status_length
+    date_updated = decode_date(date)
+    if raw_length:
+        date_updated = json.loads(data[raw_start:raw_start + raw_length])
+    return (
+        data[key_start:status_start].decode(),
+        data[status_start:raw_start].decode(),
+        date_updated,
+    )
+
+
+def export_snapshot(path, config):
+    """Сохраняем состояние бота и кэш статусов работ в снимок.
+
+    Снимок пишем во временный файл и подменяем им path, чтобы сбой
+    посередине выгрузки не оставил оборванный снимок.
+    """
+    cache = HomeworkCache(config.cache_path)
+    tmp_path = f'{path}.tmp'
+    count = 0
+    try:
+        with open(tmp_path, 'wb') as snapshot_file:
+            writer = SnapshotWriter(snapshot_file)
+            writer.write_state(load_state(config.state_path))
+            for key, status, date_updated in cache.items():
+                writer.write_homework(key, status, date_updated)
+                count += 1
+            writer.close()
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        cache.close()
+    return count
+
+
+def import_snapshot(path, config):
+    """Восстанавливаем состояние бота из снимка; снимок сперва проверяем.
+
+    Кэш статусов создаётся заново: работы, которых нет в снимке, удаляются.
+    """
+    for _ in read_snapshot(path):
+        pass
+    cache = HomeworkCache(config.cache_path, config.cache_size, flag='n')
+    count = 0
+    for kind, value in read_snapshot(path):
+        if kind == RECORD_STATE:
+            save_state(config.state_path, value)
+        else:
+            cache.set(*value)
+            count += 1
+    cache.close()
+    return count
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3 or sys.argv[1] not in ('export', 'import'):
+        sys.exit('Использование: python snapshot.py export|import <файл>')
+    command, snapshot_path = sys.argv[1:]
+    action = export_snapshot if command == 'export' else import_snapshot
+    started = time.perf_counter()
+    total = action(snapshot_path, load_config())
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f'Работ в снимке: {total}, время: {elapsed:.1f} мс')
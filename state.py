@@ -0,0 +1,130 @@
+import copy
+import dbm
+import json
+import os
+import time
+from collections import OrderedDict
+
+DEFAULT_STATE = {
+    'current_timestamp': None,
+    'digest': [],
+    'open': {},
+    'outbox': [],
+}
+
+
+def load_state(path):
+    """Читаем сохранённое состояние; без файла — состояние по умолчанию."""
+    state = copy.deepcopy(DEFAULT_STATE)
+    try:
+        with open(path, encoding='utf-8') as state_file:
+            saved = json.load(state_file)
+    except (OSError, json.JSONDecodeError):
+        return state
+    if isinstance(saved, dict):
+        state.update(
+            (key, value) for key, value in saved.items() if key in state
+        )
+    return state
+
+
+def save_state(path, state):
+    """Атомарно сохраняем состояние: пишем во временный файл и подменяем."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as state_file:
+        json.dump(state, state_file, ensure_ascii=False)
+        state_file.flush()
+        os.fsync(state_file.fileno())
+    os.replace(tmp_path, path)
+
+
+class HomeworkCache:
+    """LRU-кэш статусов работ в памяти; вытесненное хранится на диске.
+
+    В памяти держим не больше max_size записей; записи, к которым не
+    обращались дольше ttl секунд, тоже вытесняются. Изменённые записи
+    сбрасываются на диск при вытеснении и в flush(), а отсутствующие в
+    памяти подгружаются с диска при обращении.
+    """
+
+    def __init__(self, path, max_size=1000, ttl=0, clock=time.monotonic,
+                 flag='c'):
+        """Открываем хранилище path; max_size и ttl ограничивают память.
+
+        С flag='n' хранилище создаётся заново, прежние записи удаляются.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.store = dbm.open(path, flag)
+        self.entries = OrderedDict()
+        self.dirty = set()
+
+    def __len__(self):
+        """Число записей в памяти."""
+        return len(self.entries)
+
+    def get(self, key):
+        """Возвращаем (status, date_updated) работы или None."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            entry[2] = self.clock()
+            self._expire()
+            return entry[0], entry[1]
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+        status, date_updated = json.loads(raw)
+        self._put(key, status, date_updated)
+        return status, date_updated
+
+    def set(self, key, status, date_updated):
+        """Запоминаем новый статус работы."""
+        self.entries.pop(key, None)
+        self.dirty.add(key)
+        self._put(key, status, date_updated)
+
+    def _put(self, key, status, date_updated):
+        self.entries[key] = [status, date_updated, self.clock()]
+        self._expire()
+        while len(self.entries) > self.max_size:
+            self._evict(next(iter(self.entries)))
+
+    def _expire(self):
+        if not self.ttl:
+            return
+        deadline = self.clock() - self.ttl
+        while self.entries:
+            key, entry = next(iter(self.entries.items()))
+            if entry[2] > deadline:
+                break
+            self._evict(key)
+
+    def _evict(self, key):
+        status, date_updated, _ = self.entries.pop(key)
+        if key in self.dirty:
+            self.dirty.discard(key)
+            self.store[key] = json.dumps([status, date_updated])
+
+    def items(self):
+        """Все работы — из памяти и с диска: (key, status, date_updated)."""
+        self.flush()
+        for key in self.store.keys():
+            status, date_updated = json.loads(self.store[key])
+            yield key.decode(), status, date_updated
+
+    def flush(self):
+        """Сбрасываем изменённые записи на диск."""
+        for key in self.dirty:
+            if key in self.entries:
+                status, date_updated, _ = self.entries[key]
+                self.store[key] = json.dumps([status, date_updated])
+        self.dirty.clear()
+        if hasattr(self.store, 'sync'):
+            self.store.sync()
+
+    def close(self):
+        """Сохраняем изменения и закрываем хранилище."""
+        self.flush()
+        self.store.close()
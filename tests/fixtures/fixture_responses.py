@@ -0,0 +1,89 @@
+import random
+from http import HTTPStatus
+
+import pytest
+import requests
+
+KNOWN_STATUSES = ['approved', 'reviewing', 'rejected']
+ODD_VALUES = [
+    None, 0, -1, 3.14, True, '', 'unknown', 'APPROVED', [], {}, ['approved'],
+    {'status': 'approved'}, b'approved', 'Итоговый проект' * 100,
+]
+
+
+class ResponseGenerator:
+    """Генератор ответов API: корректных, больших и испорченных."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def homework(self, status=None, homework_id=None):
+        homework_id = homework_id or self.rng.randint(1, 10 ** 6)
+        return {
+            'id': homework_id,
+            'status': status or self.rng.choice(KNOWN_STATUSES),
+            'homework_name': f'student__hw{homework_id}.zip',
+            'reviewer_comment': 'Всё нравится',
+            'date_updated': '2020-02-13T14:40:57Z',
+            'lesson_name': 'Итоговый проект',
+        }
+
+    def odd_value(self):
+        return self.rng.choice(ODD_VALUES)
+
+    def malformed_homework(self):
+        homework = self.homework()
+        mutation = self.rng.randrange(4)
+        if mutation == 0:
+            del homework[self.rng.choice(['status', 'homework_name'])]
+        elif mutation == 1:
+            homework[self.rng.choice(list(homework))] = self.odd_value()
+        elif mutation == 2:
+            homework['status'] = f'status_{self.rng.randrange(100)}'
+        else:
+            return self.odd_value()
+        return homework
+
+    def payload(self, size=1, malformed=0.0):
+        homeworks = [
+            self.malformed_homework() if self.rng.random() < malformed
+            else self.homework()
+            for _ in range(size)
+        ]
+        return {'homeworks': homeworks, 'current_date': 1000198000}
+
+    def malformed_payload(self):
+        payload = self.payload(self.rng.randrange(5), malformed=0.5)
+        mutation = self.rng.randrange(4)
+        if mutation == 0:
+            payload['homeworks'] = self.odd_value()
+        elif mutation == 1:
+            del payload['homeworks']
+        elif mutation == 2:
+            return self.odd_value()
+        return payload
+
+
+class MockResponse:
+
+    def __init__(self, payload, http_status=HTTPStatus.OK):
+        self.payload = payload
+        self.status_code = http_status
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def response_generator():
+    return ResponseGenerator(seed=1000198000)
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    """Подменяет requests.get: API отвечает переданным payload."""
+    def install(payload, http_status=HTTPStatus.OK):
+        def mock_get(*args, **kwargs):
+            return MockResponse(payload, http_status)
+        monkeypatch.setattr(requests, 'get', mock_get)
+    return install
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+
+class TestReviewAnalytics:
+
+    def test_sketch_quantiles(self):
+        from analytics import QuantileSketch
+
+        rng = random.Random(1000198000)
+        values = sorted(rng.uniform(60, 7 * 24 * 3600) for _ in range(10000))
+        sketch = QuantileSketch(alpha=0.02)
+        for value in values:
+            sketch.add(value)
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.03), (
+                f'Оценка квантиля {q} должна быть точнее 3%'
+            )
+        assert len(sketch.buckets) < 1000, (
+            'Число корзин не должно расти вместе с числом значений'
+        )
+
+    def test_observe_review(self):
+        from analytics import ReviewAnalytics
+
+        analytics = ReviewAnalytics()
+        homework = {
+            'homework_name': 'hw1',
+            'status': 'approved',
+            'date_updated': '2020-02-13T16:40:57Z',
+        }
+        assert analytics.observe(
+            homework, ('reviewing', '2020-02-13T14:40:57Z')
+        )
+        assert analytics.total.count == 1
+        assert analytics.total.mean == 2 * 3600, (
+            'Время проверки считается от взятия на проверку до вердикта'
+        )
+        assert analytics.homeworks['hw1'].count == 1
+
+    def test_parse_date_is_utc(self):
+        import calendar
+
+        from analytics import parse_date
+
+        assert parse_date('2020-02-13T14:40:57Z') == calendar.timegm(
+            (2020, 2, 13, 14, 40, 57)
+        ), 'Дата из API с суффиксом Z должна разбираться как UTC'
+
+    @pytest.mark.parametrize('previous, status', [
+        (None, 'approved'),
+        (('rejected', '2020-02-13T14:40:57Z'), 'approved'),
+        (('reviewing', '2020-02-13T14:40:57Z'), 'reviewing'),
+        (('reviewing', 'вчера'), 'approved'),
+    ])
+    def test_observe_ignores_other_transitions(self, previous, status):
+        from analytics import ReviewAnalytics
+
+        analytics = ReviewAnalytics()
+        homework = {
+            'homework_name': 'hw1',
+            'status': status,
+            'date_updated': '2020-02-13T16:40:57Z',
+        }
+        assert not analytics.observe(homework, previous)
+        assert analytics.total.count == 0
+
+    def test_save_and_load(self, tmp_path):
+        from analytics import ReviewAnalytics, load_analytics, save_analytics
+
+        analytics = ReviewAnalytics()
+        analytics.observe(
+            {'homework_name': 'hw1', 'status': 'rejected',
+             'date_updated': '2020-02-14T14:40:57Z'},
+            ('reviewing', '2020-02-13T14:40:57Z'),
+        )
+        path = str(tmp_path / 'analytics.json')
+        save_analytics(path, analytics)
+        loaded = load_analytics(path)
+        assert loaded.report() == analytics.report(), (
+            'Проверьте, что статистика сохраняется без потерь'
+        )
@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+
+
+class TestConfig:
+
+    def test_defaults_without_file(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('PRACTICUM_TOKEN', raising=False)
+        import config
+
+        settings = config.load_config(str(tmp_path / 'missing.json'))
+        assert settings.retry_time == 600, (
+            'Без файла конфигурации должен использоваться RETRY_TIME = 600'
+        )
+        assert settings.practicum_token is None
+        assert 'approved' in settings.homework_statuses
+
+    def test_file_and_env_override(self, tmp_path, monkeypatch):
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps({
+            'retry_time': 30,
+            'practicum_token': 'from-file',
+        }))
+        monkeypatch.setenv('PRACTICUM_TOKEN', 'from-env')
+        import config
+
+        settings = config.load_config(str(path))
+        assert settings.retry_time == 30, (
+            'Проверьте, что настройки читаются из файла конфигурации'
+        )
+        assert settings.practicum_token == 'from-env', (
+            'Проверьте, что переменные окружения важнее файла конфигурации'
+        )
+
+    @pytest.mark.parametrize('content', [
+        '{"retry_time": "often"}',
+        '{"retry_time": 0}',
+        '{"urgent_retry_time": -60}',
+        '{"idle_retry_time": -1}',
+        '{"cache_size": 0}',
+        '{"rate_limit_burst": 0}',
+        '{"cache_ttl": -1}',
+        '{"unknown_option": 1}',
+        '[1, 2, 3]',
+        'not json',
+    ])
+    def test_invalid_file(self, tmp_path, content):
+        path = tmp_path / 'config.json'
+        path.write_text(content)
+        import config
+        from exceptions import ConfigError
+
+        with pytest.raises(ConfigError):
+            config.load_config(str(path))
+
+    def test_watcher_reload(self, tmp_path):
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps({'retry_time': 30}))
+        import config
+
+        watcher = config.ConfigWatcher(str(path))
+        assert watcher.poll() is None, (
+            'Без изменений файла конфигурация не должна перечитываться'
+        )
+        path.write_text(json.dumps({'retry_time': 60}))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert watcher.poll().retry_time == 60, (
+            'Проверьте, что изменение файла конфигурации подхватывается'
+        )
+        watcher.request_reload()
+        assert watcher.poll() is not None, (
+            'Проверьте, что по SIGHUP конфигурация перечитывается'
+        )
+
+    def test_watcher_missing_file(self, tmp_path):
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps({'retry_time': 30}))
+        import config
+        from exceptions import ConfigError
+
+        watcher = config.ConfigWatcher(str(path))
+        path.unlink()
+        with pytest.raises(ConfigError):
+            watcher.poll()
+        assert watcher.poll() is None, (
+            'Удалённый файл конфигурации не должен сбрасывать настройки '
+            'к значениям по умолчанию'
+        )
+
+    def test_paths_are_startup_only(self, monkeypatch):
+        import homework
+        from config import Config
+
+        monkeypatch.setattr(homework, 'settings', Config())
+        reloaded = homework.keep_startup_paths(Config(
+            state_path='other.json', cache_path='other.db', retry_time=30
+        ))
+        assert reloaded.state_path == 'state.json', (
+            'Пути к файлам должны применяться только при запуске бота'
+        )
+        assert reloaded.cache_path == 'homeworks.db'
+        assert reloaded.retry_time == 30
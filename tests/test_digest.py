@@ -0,0 +1,56 @@
+from utils import FakeClock
+
+
+class TestDigest:
+    HOMEWORK_STATUSES = {
+        'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
+        'reviewing': 'Работа взята на проверку ревьюером.',
+        'rejected': 'Работа проверена: у ревьюера есть замечания.'
+    }
+
+    def test_disabled_by_default(self):
+        from digest import Digest
+
+        assert not Digest().enabled, (
+            'Режим сводки должен быть выключен по умолчанию'
+        )
+
+    def test_due_by_window(self):
+        from digest import Digest
+
+        clock = FakeClock()
+        digest = Digest(window=300, clock=clock)
+        digest.add('hw1', 'approved')
+        assert not digest.is_due()
+        clock.now = 300
+        assert digest.is_due(), (
+            'Сводка должна отправляться по истечении окна'
+        )
+
+    def test_due_by_events(self):
+        from digest import Digest
+
+        digest = Digest(max_events=2, clock=FakeClock())
+        digest.add('hw1', 'approved')
+        assert not digest.is_due()
+        digest.add('hw2', 'rejected')
+        assert digest.is_due(), (
+            'Сводка должна отправляться, когда набралось N событий'
+        )
+
+    def test_render_grouped_by_status(self):
+        from digest import Digest
+
+        digest = Digest(max_events=10, clock=FakeClock())
+        digest.add('hw1', 'approved')
+        digest.add('hw2', 'rejected')
+        digest.add('hw3', 'approved')
+        message = digest.render(self.HOMEWORK_STATUSES)
+        approved = message.index(self.HOMEWORK_STATUSES['approved'])
+        rejected = message.index(self.HOMEWORK_STATUSES['rejected'])
+        assert approved < message.index('hw3') < rejected, (
+            'Работы в сводке должны быть сгруппированы по статусу'
+        )
+        events = digest.events
+        digest.clear()
+        assert not events and not digest.is_due()
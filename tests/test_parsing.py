@@ -0,0 +1,163 @@
+import logging
+import time
+
+import pytest
+
+
+@pytest.fixture
+def homework_module():
+    import homework
+
+    level = homework.logger.level
+    homework.logger.setLevel(logging.CRITICAL)
+    yield homework
+    homework.logger.setLevel(level)
+
+
+class TestParsing:
+    FUZZ_ROUNDS = 2000
+    TIMING_ROUNDS = 3
+    THROUGHPUT_FACTOR = 20
+
+    def test_get_api_answer_large_payload(self, homework_module, mock_api,
+                                          response_generator):
+        payload = response_generator.payload(size=5000)
+        mock_api(payload)
+        response = homework_module.get_api_answer(1000198000)
+        homeworks = homework_module.check_response(response)
+        assert len(homeworks) == 5000, (
+            'Проверьте, что check_response возвращает все домашние работы'
+        )
+
+    def test_fuzz_check_response(self, homework_module, response_generator):
+        from exceptions import DictEmpty, NotList
+
+        for _ in range(self.FUZZ_ROUNDS):
+            payload = response_generator.malformed_payload()
+            try:
+                homeworks = homework_module.check_response(payload)
+            except (DictEmpty, NotList, TypeError):
+                continue
+            assert isinstance(homeworks, list), (
+                'check_response должна вернуть список или выбросить ошибку '
+                f'для ответа {payload!r}'
+            )
+
+    def test_fuzz_parse_status(self, homework_module, response_generator):
+        statuses = homework_module.HOMEWORK_STATUSES
+        for _ in range(self.FUZZ_ROUNDS):
+            homework = response_generator.malformed_homework()
+            try:
+                message = homework_module.parse_status(homework)
+            except (KeyError, TypeError):
+                continue
+            assert message.endswith(statuses[homework['status']]), (
+                'parse_status вернула сообщение для некорректной работы '
+                f'{homework!r}'
+            )
+
+    def test_parsing_throughput(self, homework_module, response_generator):
+        payload = response_generator.payload(size=20000, malformed=0.1)
+
+        def parse():
+            homeworks = homework_module.check_response(payload)
+            parsed = 0
+            for homework in homeworks:
+                try:
+                    homework_module.parse_status(homework)
+                except (KeyError, TypeError):
+                    continue
+                parsed += 1
+            return parsed
+
+        def baseline():
+            for homework in payload['homeworks']:
+                try:
+                    f'{homework["homework_name"]}{homework["status"]}'
+                except (KeyError, TypeError):
+                    continue
+
+        def best_time(function):
+            timings = []
+            for _ in range(self.TIMING_ROUNDS):
+                started = time.perf_counter()
+                function()
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+
+        assert parse() > 15000
+        elapsed = best_time(parse)
+        reference = best_time(baseline)
+        assert elapsed < reference * self.THROUGHPUT_FACTOR, (
+            'Разбор домашних работ не должен быть больше чем в '
+            f'{self.THROUGHPUT_FACTOR} раз медленнее обхода ответа: '
+            f'{elapsed * 1000:.1f} мс против {reference * 1000:.1f} мс'
+        )
+
+
+class FakeDispatcher:
+
+    def __init__(self):
+        from sinks import Outbox
+
+        self.outbox = Outbox()
+        self.messages = []
+
+    def dispatch(self, message):
+        self.messages.append(message)
+
+    def resend(self):
+        pass
+
+
+class TestCheckUpdates:
+
+    def test_bad_items_are_skipped(self, homework_module, mock_api,
+                                   response_generator, tmp_path,
+                                   monkeypatch):
+        from analytics import ReviewAnalytics
+        from digest import Digest
+        from state import DEFAULT_STATE, HomeworkCache
+
+        for name, filename in (('STATE_PATH', 'state.json'),
+                               ('ANALYTICS_PATH', 'analytics.json'),
+                               ('CACHE_PATH', 'homeworks.db')):
+            monkeypatch.setattr(homework_module, name, str(tmp_path / filename))
+        first = response_generator.homework('approved', homework_id=1)
+        last = response_generator.homework('reviewing', homework_id=2)
+        unknown = response_generator.homework(homework_id=3)
+        unknown['status'] = 'lost'
+        mock_api({
+            'homeworks': [first, ['not', 'a', 'dict'], unknown, None, last],
+            'current_date': 1000198000,
+        })
+        dispatcher = FakeDispatcher()
+        cache = HomeworkCache(str(tmp_path / 'homeworks.db'))
+        state = {**DEFAULT_STATE, 'open': {}, 'current_timestamp': 1}
+        homework_module.check_updates(
+            dispatcher, Digest(), cache, ReviewAnalytics(), state
+        )
+        assert len(dispatcher.messages) == 2, (
+            'Некорректные работы в ответе API должны пропускаться, '
+            'а остальные — обрабатываться'
+        )
+        assert cache.get('1') is not None and cache.get('2') is not None
+        assert cache.get('3') is None
+        assert state['open'] == {'2': 'reviewing'}
+        cache.close()
+
+    def test_digest_sent_when_disabled(self, homework_module):
+        from digest import Digest
+
+        dispatcher = FakeDispatcher()
+        digest = Digest(window=300)
+        digest.add('hw1.zip', 'approved')
+        homework_module.flush_digest(dispatcher, digest)
+        assert dispatcher.messages == []
+        digest.window = 0
+        homework_module.flush_digest(dispatcher, digest)
+        assert len(dispatcher.messages) == 1, (
+            'Накопленная сводка должна отправляться, если режим сводки '
+            'отключили в конфигурации'
+        )
+        assert digest.events == []
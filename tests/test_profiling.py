@@ -0,0 +1,75 @@
+from utils import FakeClock
+
+
+class TestProfiler:
+
+    def test_disabled_does_not_record(self):
+        from profiling import Profiler
+
+        profiler = Profiler()
+        with profiler.stage('http'):
+            pass
+        assert not profiler.stages, (
+            'Без включённого профилирования замеры не должны копиться'
+        )
+        assert profiler.end_cycle() == []
+
+    def test_summary_after_cycles(self):
+        from profiling import Profiler
+
+        profiler = Profiler(clock=FakeClock(step=0.5))
+        profiler.configure(True, 2, 1, '.')
+        for _ in range(2):
+            profiler.start_cycle()
+            with profiler.stage('http'):
+                pass
+            reports = profiler.end_cycle()
+        assert len(reports) == 1 and 'http: 2, 1000.0' in reports[0], (
+            'Проверьте, что сводка по этапам выводится раз в N циклов'
+        )
+        assert not profiler.stages, (
+            'После сводки счётчики этапов должны обнуляться'
+        )
+
+    def test_capture_on_request(self, tmp_path):
+        from profiling import Profiler
+
+        profiler = Profiler()
+        profiler.configure(False, 10, 1, str(tmp_path))
+        profiler.request_capture()
+        profiler.start_cycle()
+        sorted(range(1000))
+        reports = profiler.end_cycle()
+        assert len(reports) == 1, (
+            'Проверьте, что по сигналу снимается профиль cProfile'
+        )
+        assert list(tmp_path.glob('profile-*.pstats')), (
+            'Профиль должен сохраняться в файл .pstats'
+        )
+
+    def test_record_from_threads(self):
+        import threading
+
+        from profiling import Profiler
+
+        profiler = Profiler()
+        profiler.configure(True, 1, 1, '.')
+
+        def record_many():
+            for number in range(2000):
+                profiler.record(f'stage-{number % 50}', 0.001)
+
+        threads = [threading.Thread(target=record_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        reports = [profiler.summary() for _ in range(50)]
+        for thread in threads:
+            thread.join()
+        reports.append(profiler.summary())
+        calls = sum(
+            int(line.split(': ')[1].split(',')[0])
+            for report in reports for line in report.splitlines()[1:]
+        )
+        assert calls == 8000, (
+            'Проверьте, что замеры из разных потоков не теряются'
+        )
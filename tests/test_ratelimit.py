@@ -0,0 +1,74 @@
+from utils import FakeClock
+
+
+class TestRateLimiter:
+
+    def test_burst_then_wait(self, tmp_path):
+        from ratelimit import RateLimiter
+
+        clock = FakeClock(now=1000198000.0)
+        limiter = RateLimiter(str(tmp_path / 'limit.db'), per_minute=60,
+                              burst=3, clock=clock)
+        delays = [limiter.try_acquire() for _ in range(4)]
+        assert delays[:3] == [0, 0, 0], (
+            'Первые burst запросов должны проходить без ожидания'
+        )
+        assert delays[3] > 0, (
+            'После исчерпания корзины запрос должен ждать токен'
+        )
+        clock.now += 1
+        assert limiter.try_acquire() == 0, (
+            'Токены должны восполняться со скоростью per_minute'
+        )
+
+    def test_shared_between_limiters(self, tmp_path):
+        from ratelimit import RateLimiter
+
+        clock = FakeClock(now=1000198000.0)
+        path = str(tmp_path / 'limit.db')
+        first = RateLimiter(path, per_minute=60, burst=2, clock=clock)
+        second = RateLimiter(path, per_minute=60, burst=2, clock=clock)
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == 0
+        assert first.try_acquire() > 0, (
+            'Лимит должен быть общим для всех воркеров с одним файлом'
+        )
+
+    def test_acquire_interrupted(self, tmp_path):
+        from ratelimit import RateLimiter
+
+        limiter = RateLimiter(str(tmp_path / 'limit.db'), per_minute=1,
+                              burst=1, clock=FakeClock(now=1000198000.0))
+        assert limiter.acquire(wait=lambda delay: True)
+        assert not limiter.acquire(wait=lambda delay: True), (
+            'Ожидание токена должно прерываться при остановке бота'
+        )
+
+    def test_phase_offset_spread(self):
+        from ratelimit import phase_offset
+
+        offsets = [phase_offset(f'token{number}', 600)
+                   for number in range(1000)]
+        assert all(0 <= offset < 600 for offset in offsets)
+        assert phase_offset('token1', 600) == offsets[1], (
+            'Сдвиг для одного ключа должен быть стабильным'
+        )
+        assert len({offset // 60 for offset in offsets}) == 10, (
+            'Сдвиги должны распределяться по всему периоду'
+        )
+
+    def test_unavailable_database_does_not_stop_polling(
+            self, tmp_path, monkeypatch, mock_api):
+        import logging
+
+        import homework
+        from ratelimit import RateLimiter
+
+        limiter = RateLimiter(str(tmp_path / 'missing' / 'limit.db'),
+                              per_minute=60, burst=3)
+        monkeypatch.setattr(homework, 'rate_limiter', limiter)
+        monkeypatch.setattr(homework.logger, 'level', logging.CRITICAL)
+        mock_api({'homeworks': [], 'current_date': 1000198000})
+        assert homework.get_api_answer(1000198000) == {
+            'homeworks': [], 'current_date': 1000198000
+        }, 'Без базы ограничителя бот должен опрашивать API без лимита'
@@ -0,0 +1,72 @@
+import pytest
+
+
+class TestPollInterval:
+
+    @pytest.fixture
+    def homework_module(self, monkeypatch):
+        import homework
+
+        monkeypatch.setattr(homework, 'RETRY_TIME', 600)
+        monkeypatch.setattr(homework, 'URGENT_RETRY_TIME', 60)
+        monkeypatch.setattr(homework, 'IDLE_RETRY_TIME', 3600)
+        monkeypatch.setattr(homework, 'CACHE_SIZE', 1000)
+        return homework
+
+    def test_reviewing_is_polled_first(self, homework_module):
+        state = {'open': {}}
+        homework_module.track_open(state, '1', 'rejected')
+        homework_module.track_open(state, '2', 'reviewing')
+        assert homework_module.poll_interval(state) == 60, (
+            'Пока работа на проверке, опрашивать API нужно чаще'
+        )
+
+    def test_rejected_uses_retry_time(self, homework_module):
+        state = {'open': {}}
+        homework_module.track_open(state, '1', 'reviewing')
+        homework_module.track_open(state, '1', 'rejected')
+        assert homework_module.poll_interval(state) == 600
+
+    def test_all_approved_is_deferred(self, homework_module):
+        state = {'open': {}}
+        homework_module.track_open(state, '1', 'reviewing')
+        homework_module.track_open(state, '1', 'approved')
+        assert homework_module.poll_interval(state) == 3600, (
+            'Когда все работы приняты, опрашивать API нужно реже'
+        )
+
+    def test_open_homeworks_are_bounded(self, homework_module,
+                                        monkeypatch):
+        monkeypatch.setattr(homework_module, 'CACHE_SIZE', 3)
+        state = {'open': {}}
+        homework_module.track_open(state, '1', 'reviewing')
+        for key in ('2', '3', '4', '1'):
+            homework_module.track_open(state, key, 'rejected')
+        assert list(state['open']) == ['3', '4', '1'], (
+            'Проверьте, что незакрытых работ хранится не больше cache_size, '
+            'а вытесняются давно не менявшиеся'
+        )
+
+    def test_defaults_to_retry_time(self, homework_module, monkeypatch):
+        monkeypatch.setattr(homework_module, 'URGENT_RETRY_TIME', 0)
+        monkeypatch.setattr(homework_module, 'IDLE_RETRY_TIME', 0)
+        assert homework_module.poll_interval({'open': {}}) == 600
+        assert homework_module.poll_interval(
+            {'open': {'1': 'reviewing'}}
+        ) == 600
+
+    def test_poll_due_wakes_on_reload(self, homework_module):
+        import time
+
+        state = {'open': {}}
+        assert homework_module.poll_due(None, state), (
+            'Первый опрос API должен выполняться сразу'
+        )
+        assert homework_module.poll_due(time.monotonic() - 3600, state)
+        homework_module.wakeup.set()
+        started = time.monotonic()
+        assert not homework_module.poll_due(time.monotonic(), state)
+        assert time.monotonic() - started < 1, (
+            'Сигнал перезагрузки должен прерывать ожидание опроса'
+        )
+        assert not homework_module.wakeup.is_set()
@@ -0,0 +1,90 @@
+import signal
+
+import pytest
+
+
+@pytest.fixture
+def homework_module(monkeypatch):
+    import homework
+
+    monkeypatch.setattr(homework, 'stop_signals', [])
+    yield homework
+    homework.shutdown.clear()
+    homework.wakeup.clear()
+
+
+class TestShutdown:
+
+    def test_handler_does_not_log(self, homework_module, monkeypatch):
+        monkeypatch.setattr(homework_module.profiler, 'enabled', True)
+        with homework_module.profiler.lock:
+            homework_module.request_shutdown(signal.SIGTERM, None)
+        assert homework_module.shutdown.is_set()
+        assert homework_module.wakeup.is_set(), (
+            'Сигнал остановки должен прерывать ожидание опроса'
+        )
+        assert homework_module.stop_signals == [signal.SIGTERM]
+
+    def test_main_drains_on_shutdown(self, homework_module, monkeypatch,
+                                     mock_api, response_generator,
+                                     tmp_path):
+        import json
+        import threading
+        import time
+
+        import telegram
+        from config import Config
+
+        sent = []
+
+        class FakeBot:
+
+            def __init__(self, token):
+                self.token = token
+
+            def send_message(self, chat_id, message):
+                sent.append(message)
+
+        monkeypatch.setenv('BOT_CONFIG', str(tmp_path / 'config.json'))
+        monkeypatch.setattr(telegram, 'Bot', FakeBot)
+        monkeypatch.setattr(homework_module, 'settings', Config())
+        monkeypatch.setattr(
+            homework_module, 'set_signal_handlers', lambda watcher: None
+        )
+        values = {
+            'PRACTICUM_TOKEN': 'practicum', 'TELEGRAM_TOKEN': 'telegram',
+            'TELEGRAM_CHAT_ID': '1', 'RETRY_TIME': 600,
+            'URGENT_RETRY_TIME': 0, 'IDLE_RETRY_TIME': 0,
+            'DIGEST_WINDOW': 3600, 'DIGEST_MAX_EVENTS': 0,
+            'SPREAD_POLLS': False, 'rate_limiter': None,
+            'STATE_PATH': str(tmp_path / 'state.json'),
+            'CACHE_PATH': str(tmp_path / 'homeworks.db'),
+            'ANALYTICS_PATH': str(tmp_path / 'analytics.json'),
+        }
+        for name, value in values.items():
+            monkeypatch.setattr(homework_module, name, value)
+        mock_api({
+            'homeworks': [response_generator.homework('reviewing')],
+            'current_date': 1000198000,
+        })
+        bot = threading.Thread(target=homework_module.main)
+        bot.start()
+        for _ in range(100):
+            if (tmp_path / 'state.json').exists():
+                break
+            time.sleep(0.05)
+        homework_module.request_shutdown(signal.SIGTERM, None)
+        bot.join(5)
+        assert not bot.is_alive(), (
+            'По SIGTERM бот должен прервать ожидание и выйти из цикла'
+        )
+        assert len(sent) == 1 and sent[0].startswith('Изменились'), (
+            'При остановке накопленная сводка должна быть отправлена'
+        )
+        with open(tmp_path / 'state.json', encoding='utf-8') as state_file:
+            state = json.load(state_file)
+        assert state['digest'] == [] and state['outbox'] == [], (
+            'После остановки состояние должно быть сохранено без '
+            'неотправленных сообщений'
+        )
+        assert (tmp_path / 'analytics.json').exists()
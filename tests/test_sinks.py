@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+
+import pytest
+
+
+class TestSinks:
+
+    def test_retries_then_error(self):
+        from exceptions import SinkError
+        from sinks import FunctionSink
+
+        calls = []
+
+        def failing(message):
+            calls.append(message)
+            raise ConnectionError('нет связи')
+
+        sink = FunctionSink('test', failing, retries=2, retry_delay=0)
+        with pytest.raises(SinkError):
+            sink.deliver('текст')
+        assert len(calls) == 3, (
+            'Проверьте, что канал повторяет доставку retries раз'
+        )
+
+    def test_sink_requires_send(self):
+        from sinks import Sink
+
+        with pytest.raises(TypeError):
+            Sink('abstract')
+
+    def test_file_sink(self, tmp_path):
+        from sinks import FileSink
+
+        path = tmp_path / 'messages.txt'
+        sink = FileSink('file', path=str(path))
+        sink.deliver('первое')
+        sink.deliver('второе')
+        assert path.read_text(encoding='utf-8') == 'первое\nвторое\n'
+
+    @pytest.mark.parametrize('specs', [
+        [{'type': 'pigeon'}],
+        [{'type': 'webhook'}],
+        [{'type': 'file', 'colour': 'red'}],
+        [{'type': 'file'}, {'type': 'file', 'path': 'messages.txt'}],
+        [{'type': 'telegram'}, {'type': 'file', 'name': 'telegram'}],
+    ])
+    def test_build_invalid_sinks(self, specs):
+        from exceptions import ConfigError
+        from sinks import build_sinks
+
+        with pytest.raises(ConfigError):
+            build_sinks(specs, print)
+
+    def test_slow_sink_does_not_delay_others(self):
+        from sinks import Dispatcher, FunctionSink, Outbox
+
+        release = threading.Event()
+        delivered = threading.Event()
+        sinks = [
+            FunctionSink('slow', lambda message: release.wait(5)),
+            FunctionSink('fast', lambda message: delivered.set()),
+        ]
+        dispatcher = Dispatcher(sinks, logging.getLogger(__name__), Outbox())
+        dispatcher.dispatch('текст')
+        assert delivered.wait(1), (
+            'Медленный канал не должен задерживать доставку в остальные'
+        )
+        release.set()
+        assert dispatcher.close(timeout=5) == 0, (
+            'Проверьте, что close() дожидается доставки всех сообщений'
+        )
+
+    def test_failed_message_stays_in_outbox(self):
+        from sinks import Dispatcher, FunctionSink, Outbox
+
+        def failing(message):
+            raise ConnectionError('нет связи')
+
+        outbox = Outbox()
+        sinks = [FunctionSink('broken', failing, retries=0)]
+        dispatcher = Dispatcher(sinks, logging.getLogger(__name__), outbox)
+        dispatcher.dispatch('текст')
+        assert dispatcher.close(timeout=5) == 1, (
+            'Проверьте, что close() возвращает число недоставленных сообщений'
+        )
+        assert outbox.snapshot() == [['broken', 'текст']], (
+            'Недоставленное сообщение должно остаться в outbox'
+        )
+
+    def test_resend_delivers_saved_outbox(self):
+        from sinks import Dispatcher, FunctionSink, Outbox
+
+        delivered = []
+        outbox = Outbox([['log', 'первое'], ['removed', 'второе']])
+        sinks = [FunctionSink('log', delivered.append)]
+        dispatcher = Dispatcher(sinks, logging.getLogger(__name__), outbox)
+        dispatcher.resend()
+        assert dispatcher.close(timeout=5) == 0
+        assert delivered == ['первое'], (
+            'Проверьте, что resend() досылает сообщения из outbox'
+        )
+
+    def test_close_enforces_deadline(self):
+        from sinks import Dispatcher, FunctionSink, Outbox
+
+        release = threading.Event()
+        outbox = Outbox()
+        sinks = [FunctionSink('slow', lambda message: release.wait(5))]
+        dispatcher = Dispatcher(sinks, logging.getLogger(__name__), outbox)
+        for number in range(3):
+            dispatcher.dispatch(f'сообщение {number}')
+        started = time.monotonic()
+        assert dispatcher.close(timeout=0.1) == 3, (
+            'Проверьте, что close() не ждёт дольше timeout'
+        )
+        release.set()
+        for thread in threading.enumerate():
+            if thread.name.startswith('sink-slow'):
+                thread.join(5)
+        assert time.monotonic() - started < 2, (
+            'Проверьте, что close() отменяет сообщения в очереди'
+        )
+        assert len(outbox) == 2, (
+            'Отменённые сообщения должны остаться в outbox'
+        )
+
+    def test_reload_during_slow_send(self):
+        from sinks import Dispatcher, FunctionSink, Outbox
+
+        sent = []
+
+        def slow(message):
+            time.sleep(0.3)
+            sent.append(message)
+
+        outbox = Outbox()
+        logger = logging.getLogger(__name__)
+        old = Dispatcher([FunctionSink('slow', slow)], logger, outbox)
+        old.dispatch('привет')
+        time.sleep(0.05)
+        new = Dispatcher([FunctionSink('slow', slow)], logger, outbox)
+        old.close(timeout=0)
+        new.resend()
+        for thread in threading.enumerate():
+            if thread.name.startswith('sink-slow'):
+                thread.join(5)
+        new.resend()
+        assert new.close(timeout=5) == 0
+        assert sent == ['привет'], (
+            'Сообщение, которое доставляется во время перезагрузки, '
+            'не должно отправляться повторно'
+        )
@@ -0,0 +1,134 @@
+import pytest
+
+
+@pytest.fixture
+def bot_config(tmp_path):
+    from config import Config
+
+    return Config(
+        state_path=str(tmp_path / 'state.json'),
+        cache_path=str(tmp_path / 'homeworks.db'),
+    )
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, bot_config):
+    from snapshot import export_snapshot
+    from state import HomeworkCache, save_state
+
+    save_state(bot_config.state_path, {
+        'current_timestamp': 1000198000,
+        'digest': [['hw1', 'approved']],
+        'open': {'2': 'reviewing'},
+        'outbox': [['telegram', 'Изменился статус']],
+    })
+    cache = HomeworkCache(bot_config.cache_path, max_size=10)
+    for homework_id in range(100):
+        cache.set(str(homework_id), 'approved', '2020-02-13T14:40:57Z')
+    cache.set('2', 'reviewing', None)
+    cache.close()
+    path = tmp_path / 'snapshot.bin'
+    assert export_snapshot(str(path), bot_config) == 100
+    return path
+
+
+class TestSnapshot:
+
+    def test_round_trip(self, tmp_path, snapshot_path):
+        from config import Config
+        from snapshot import import_snapshot
+        from state import HomeworkCache, load_state
+
+        target = Config(
+            state_path=str(tmp_path / 'new_state.json'),
+            cache_path=str(tmp_path / 'new_homeworks.db'),
+        )
+        stale = HomeworkCache(target.cache_path)
+        stale.set('500', 'reviewing', None)
+        stale.close()
+        assert import_snapshot(str(snapshot_path), target) == 100
+        state = load_state(target.state_path)
+        assert state['current_timestamp'] == 1000198000
+        assert state['digest'] == [['hw1', 'approved']], (
+            'Неотправленная сводка должна переноситься в снимке'
+        )
+        assert state['open'] == {'2': 'reviewing'}
+        assert state['outbox'] == [['telegram', 'Изменился статус']], (
+            'Недоставленные сообщения должны переноситься в снимке'
+        )
+        cache = HomeworkCache(target.cache_path)
+        assert cache.get('99') == ('approved', '2020-02-13T14:40:57Z')
+        assert cache.get('2') == ('reviewing', None), (
+            'Статусы работ должны восстанавливаться из снимка'
+        )
+        assert cache.get('500') is None, (
+            'Работы, которых нет в снимке, не должны оставаться в кэше'
+        )
+        cache.close()
+
+    def test_unusual_values_round_trip(self, tmp_path, bot_config):
+        from snapshot import RECORD_HOMEWORK, export_snapshot, read_snapshot
+        from state import HomeworkCache
+
+        homeworks = [
+            ('1', 'reviewing' * 100, '2020-02-13T14:40:57Z'),
+            ('2', 'approved', '2020-02-13T14:40:57.123Z'),
+            ('3', 'approved', '2020-02-13T14:40:57+03:00'),
+            ('4', 'approved', '2020-02-30T14:40:57Z'),
+            ('5', 'approved', 1581604857),
+            ('6', 'approved', None),
+        ]
+        cache = HomeworkCache(bot_config.cache_path)
+        for homework in homeworks:
+            cache.set(*homework)
+        cache.close()
+        path = tmp_path / 'snapshot.bin'
+        assert export_snapshot(str(path), bot_config) == len(homeworks)
+        restored = sorted(
+            value for kind, value in read_snapshot(str(path))
+            if kind == RECORD_HOMEWORK
+        )
+        assert restored == homeworks, (
+            'Длинные статусы и нестандартные даты должны сохраняться в '
+            'снимке без изменений'
+        )
+
+    def test_failed_export_keeps_old_snapshot(self, tmp_path, bot_config,
+                                              snapshot_path, monkeypatch):
+        import snapshot
+
+        original = snapshot_path.read_bytes()
+
+        def broken(self, key, status, date_updated):
+            raise OSError('диск заполнен')
+
+        monkeypatch.setattr(snapshot.SnapshotWriter, 'write_homework', broken)
+        with pytest.raises(OSError):
+            snapshot.export_snapshot(str(snapshot_path), bot_config)
+        assert snapshot_path.read_bytes() == original, (
+            'Сбой выгрузки не должен портить существующий снимок'
+        )
+        assert not (tmp_path / 'snapshot.bin.tmp').exists()
+
+    @pytest.mark.parametrize('corrupt', [
+        lambda data: b'',
+        lambda data: b'XXXX' + data[4:],
+        lambda data: data[:4] + b'\x09\x00' + data[6:],
+        lambda data: data[:len(data) // 2],
+        lambda data: data[:40] + bytes([data[40] ^ 0xFF]) + data[41:],
+    ])
+    def test_corrupted_snapshot(self, tmp_path, snapshot_path, corrupt):
+        from config import Config
+        from exceptions import SnapshotError
+        from snapshot import import_snapshot
+
+        snapshot_path.write_bytes(corrupt(snapshot_path.read_bytes()))
+        target = Config(
+            state_path=str(tmp_path / 'new_state.json'),
+            cache_path=str(tmp_path / 'new_homeworks.db'),
+        )
+        with pytest.raises(SnapshotError):
+            import_snapshot(str(snapshot_path), target)
+        assert not (tmp_path / 'new_state.json').exists(), (
+            'Повреждённый снимок не должен применяться даже частично'
+        )
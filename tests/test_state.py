@@ -0,0 +1,95 @@
+from utils import FakeClock
+
+
+class TestState:
+
+    def test_load_missing_state(self, tmp_path):
+        import state
+
+        loaded = state.load_state(str(tmp_path / 'state.json'))
+        assert loaded == state.DEFAULT_STATE, (
+            'Без файла состояния должно возвращаться состояние по умолчанию'
+        )
+
+    def test_save_and_load(self, tmp_path):
+        import state
+
+        path = str(tmp_path / 'state.json')
+        saved = {
+            'current_timestamp': 1000198000,
+            'digest': [['hw123', 'approved']],
+            'open': {'123': 'reviewing'},
+            'outbox': [['telegram', 'текст']],
+        }
+        state.save_state(path, saved)
+        assert state.load_state(path) == saved, (
+            'Проверьте, что сохранённое состояние читается без потерь'
+        )
+        assert not (tmp_path / 'state.json.tmp').exists(), (
+            'Временный файл должен подменять файл состояния'
+        )
+
+    def test_load_corrupted_state(self, tmp_path):
+        import state
+
+        path = tmp_path / 'state.json'
+        path.write_text('{"current_timestamp": 1')
+        assert state.load_state(str(path)) == state.DEFAULT_STATE, (
+            'Повреждённый файл состояния не должен ронять бота'
+        )
+
+
+class TestHomeworkCache:
+
+    def test_memory_is_bounded(self, tmp_path):
+        from state import HomeworkCache
+
+        cache = HomeworkCache(str(tmp_path / 'cache'), max_size=10)
+        for homework_id in range(1000):
+            cache.set(str(homework_id), 'approved', '2020-02-13T14:40:57Z')
+        assert len(cache) == 10, (
+            'В памяти должно храниться не больше max_size работ'
+        )
+        assert cache.get('0') == ('approved', '2020-02-13T14:40:57Z'), (
+            'Вытесненная работа должна подгружаться с диска'
+        )
+        cache.close()
+
+    def test_ttl_eviction(self, tmp_path):
+        from state import HomeworkCache
+
+        clock = FakeClock()
+        cache = HomeworkCache(str(tmp_path / 'cache'), ttl=60, clock=clock)
+        cache.set('1', 'reviewing', None)
+        clock.now = 61
+        cache.set('2', 'approved', None)
+        assert len(cache) == 1, (
+            'Работы без обращений дольше ttl должны вытесняться из памяти'
+        )
+        assert cache.get('1') == ('reviewing', None)
+        cache.close()
+
+    def test_entry_evicted_on_set(self, tmp_path):
+        from state import HomeworkCache
+
+        cache = HomeworkCache(str(tmp_path / 'cache'), max_size=0)
+        cache.set('1', 'approved', None)
+        cache.flush()
+        assert cache.get('1') == ('approved', None), (
+            'Работа, вытесненная сразу при записи, должна сохраниться на диск'
+        )
+        cache.close()
+
+    def test_persisted_between_runs(self, tmp_path):
+        from state import HomeworkCache
+
+        path = str(tmp_path / 'cache')
+        cache = HomeworkCache(path)
+        cache.set('1', 'rejected', '2020-02-13T14:40:57Z')
+        cache.close()
+        cache = HomeworkCache(path)
+        assert cache.get('1') == ('rejected', '2020-02-13T14:40:57Z'), (
+            'Проверьте, что состояние работ сохраняется на диск'
+        )
+        assert cache.get('2') is None
+        cache.close()
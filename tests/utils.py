@@ -37,3 +37,14 @@ def check_default_var_exists(scope: ModuleType, var_name: str) -> None:
         f'{var_name} должна быть переменной, а не функцией.'
     )
 
+
+class FakeClock:
+    """Controllable clock: returns `now`, advancing it by `step` per call"""
+
+    def __init__(self, now: float = 0, step: float = 0):
+        self.now = now
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now